@@ -1,9 +1,9 @@
 """Stim compiler pass for Graphix."""
 
 from graphix_stim_compiler.graphix_stim_compiler import (
-    cm_stim_pass, pauli_string_to_stim
+    CacheInfo, cache_info, clear_cache, cm_stim_pass, pauli_string_to_stim
 )
 
 __all__ = [
-    "cm_stim_pass", "pauli_string_to_stim"
+    "CacheInfo", "cache_info", "clear_cache", "cm_stim_pass", "pauli_string_to_stim"
 ]
@@ -2,16 +2,119 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal, TypeAlias
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Literal, NamedTuple, TypeAlias
 
+import numpy as np
 import stim
-from graphix.fundamentals import Sign
+from graphix.fundamentals import Axis, Sign
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import numpy.typing as npt
     from graphix.circ_ext.extraction import CliffordMap, PauliString
     from graphix.transpiler import Circuit
 
     _SYNTH_METHOD: TypeAlias = Literal["elimination", "graph_state"]
+    _INSTRUCTIONS: TypeAlias = tuple[tuple[str, tuple[int, ...]], ...]
+
+
+# Enum members used in per-node loops are bound to module-level names, since looking them up on their class is several
+# times slower than a global name lookup.
+_AXIS_X = Axis.X
+_AXIS_Z = Axis.Z
+_SIGN_PLUS = Sign.PLUS
+_SIGN_MINUS = Sign.MINUS
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the synthesis cache used by :func:`cm_stim_pass`.
+
+    Attributes
+    ----------
+    hits: int
+        Number of synthesis requests answered from the cache.
+    misses: int
+        Number of synthesis requests which required calling stim.
+    maxsize: int
+        Maximum number of synthesized circuits kept in the cache.
+    currsize: int
+        Number of synthesized circuits currently in the cache.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@dataclass
+class _SynthesisCache:
+    """Least-recently-used cache of circuits synthesized from tableaux.
+
+    Synthesis is by far the most expensive step of :func:`cm_stim_pass`, while identical Clifford maps are routinely compiled several times (e.g., when the non-Clifford angles of a pattern are substituted). Entries are keyed on the bit-packed content of the tableau, so structurally identical Clifford maps share the same entry.
+
+    Circuits are stored lowered by :func:`_lower_stim_circuit`, so that a cache hit can be replayed without decoding the stim circuit again.
+
+    The cache is shared by all the calls to :func:`cm_stim_pass` and is thread-safe: entries and statistics are only accessed while holding ``lock``. As in :func:`functools.lru_cache`, the lock is released during synthesis, so concurrent misses on the same tableau may synthesize it more than once.
+    """
+
+    maxsize: int
+    entries: OrderedDict[tuple[int, bytes, str], _INSTRUCTIONS] = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def synthesize(self, tableau: stim.Tableau, method: _SYNTH_METHOD) -> _INSTRUCTIONS:
+        """Return the lowered circuit synthesized from ``tableau``, calling stim only on cache misses."""
+        key = (len(tableau), b"".join(a.tobytes() for a in tableau.to_numpy(bit_packed=True)), method)
+        with self.lock:
+            instructions = self.entries.get(key)
+            if instructions is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return instructions
+            self.misses += 1
+        instructions = _lower_stim_circuit(tableau.to_circuit(method))
+        with self.lock:
+            self.entries[key] = instructions
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return instructions
+
+    def info(self) -> CacheInfo:
+        """Return a consistent snapshot of the cache statistics."""
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_SYNTHESIS_CACHE = _SynthesisCache(maxsize=128)
+
+
+def cache_info() -> CacheInfo:
+    """Return the statistics of the synthesis cache used by :func:`cm_stim_pass`.
+
+    Returns
+    -------
+    CacheInfo
+    """
+    return _SYNTHESIS_CACHE.info()
+
+
+def clear_cache() -> None:
+    """Clear the synthesis cache used by :func:`cm_stim_pass`."""
+    _SYNTHESIS_CACHE.clear()
 
 
 def cm_stim_pass(clifford_map: CliffordMap, circuit: Circuit) -> None:
@@ -31,6 +134,8 @@ def cm_stim_pass(clifford_map: CliffordMap, circuit: Circuit) -> None:
     This pass only handles unitaries (Clifford maps with the same number of input and ouptut nodes).
 
     Gate set: H, S, CNOT
+
+    No gate is added if the Clifford map is the identity.
     """
 
     def clifford_map_to_stim_tableau(clifford_map: CliffordMap) -> stim.Tableau:
@@ -49,24 +154,43 @@ def cm_stim_pass(clifford_map: CliffordMap, circuit: Circuit) -> None:
         ------
         NotImplementedError
             If ``len(self.input_nodes) != len(self.output_nodes)``.
+        ValueError
+            If a Pauli string is not compatible with the number of qubits or if the Pauli strings don't describe a valid Clifford operation.
         """
         if len(clifford_map.input_nodes) != len(clifford_map.output_nodes):
             raise NotImplementedError(
                 ":func:`cm_stim_pass` does not support circuit compilation if the number of input and output nodes is different (isometry)."
             )
 
-        xs: list[stim.PauliString] = []
-        zs: list[stim.PauliString] = []
         n_qubits = len(clifford_map.output_nodes)
 
-        for qubit in range(n_qubits):
-            xs.append(pauli_string_to_stim(clifford_map.x_map[qubit], n_qubits))
-            zs.append(pauli_string_to_stim(clifford_map.z_map[qubit], n_qubits))
-
-        return stim.Tableau.from_conjugated_generators(xs=xs, zs=zs)
+        # The four quadrants of the tableau are filled in place and handed to stim at once, which avoids building
+        # (and having stim parse) an intermediate `stim.PauliString` per generator.
+        x2x = np.zeros((n_qubits, n_qubits), dtype=np.bool_)
+        x2z = np.zeros((n_qubits, n_qubits), dtype=np.bool_)
+        z2x = np.zeros((n_qubits, n_qubits), dtype=np.bool_)
+        z2z = np.zeros((n_qubits, n_qubits), dtype=np.bool_)
+        x_signs = np.zeros(n_qubits, dtype=np.bool_)
+        z_signs = np.zeros(n_qubits, dtype=np.bool_)
 
-    def to_stim_circuit(clifford_map: CliffordMap, method: _SYNTH_METHOD) -> stim.Circuit:
-        """Transpile the Clifford map into a stim circuit.
+        x_map, z_map = clifford_map.x_map, clifford_map.z_map
+        for qubit in range(n_qubits):
+            x_ps = x_map[qubit]
+            z_ps = z_map[qubit]
+            _check_pauli_string(x_ps, n_qubits)
+            _check_pauli_string(z_ps, n_qubits)
+            _write_pauli_string(x_ps, x2x[qubit], x2z[qubit])
+            _write_pauli_string(z_ps, z2x[qubit], z2z[qubit])
+            x_signs[qubit] = x_ps.sign is _SIGN_MINUS
+            z_signs[qubit] = z_ps.sign is _SIGN_MINUS
+
+        # stim's stubs declare the static method `from_numpy` with a `self` argument
+        return stim.Tableau.from_numpy(  # type: ignore[call-arg]
+            x2x=x2x, x2z=x2z, z2x=z2x, z2z=z2z, x_signs=x_signs, z_signs=z_signs
+        )
+
+    def to_instructions(clifford_map: CliffordMap, method: _SYNTH_METHOD) -> _INSTRUCTIONS:
+        """Transpile the Clifford map into a sequence of gates using stim.
 
         Parameters
         ----------
@@ -77,34 +201,28 @@ def cm_stim_pass(clifford_map: CliffordMap, circuit: Circuit) -> None:
 
         Returns
         -------
-        stim.Circuit
+        tuple[tuple[str, tuple[int, ...]], ...]
+            The ``(gate name, qubit indices)`` pairs of the synthesized stim circuit, see :func:`_lower_stim_circuit`.
 
         Notes
         -----
         See https://github.com/quantumlib/Stim/blob/main/doc/python_api_reference_vDev.md#stim.Tableau.to_circuit for additional information.
+
+        Synthesized circuits are memoized, see :func:`cache_info` and :func:`clear_cache`.
         """
-        return clifford_map_to_stim_tableau(clifford_map).to_circuit(method)
-
-    stim_circuit = to_stim_circuit(clifford_map, method="elimination")  # Gate set: H, S, CX
-
-    # "stim.Circuit" has no attribute "__iter__"
-    # (but __len__ and __getitem__)
-    instruction: stim.CircuitInstruction
-    for instruction in stim_circuit:  # type: ignore[attr-defined]
-        match instruction.name:
-            case "CX":
-                for control, target in instruction.target_groups():
-                    assert control.qubit_value is not None
-                    assert target.qubit_value is not None
-                    circuit.cnot(control.qubit_value, target.qubit_value)
-            case "H":
-                for (qubit,) in instruction.target_groups():
-                    assert qubit.qubit_value is not None
-                    circuit.h(qubit.qubit_value)
-            case "S":
-                for (qubit,) in instruction.target_groups():
-                    assert qubit.qubit_value is not None
-                    circuit.s(qubit.qubit_value)
+        return _SYNTHESIS_CACHE.synthesize(clifford_map_to_stim_tableau(clifford_map), method)
+
+    if _is_identity(clifford_map):
+        return
+
+    # Gate set: H, S, CX
+    # "graph_state" emits 2-5x fewer gates on random tableaux of 2 to 100 qubits, but it only prepares the stabilizer
+    # state of the tableau from |0...0> (it starts with RX resets), so it does not implement the Clifford map on
+    # arbitrary inputs.
+    instructions = to_instructions(clifford_map, method="elimination")
+
+    for name, qubits in instructions:
+        _GATE_EMITTERS[name](circuit, qubits)
 
 
 def pauli_string_to_stim(ps: PauliString, n_qubits: int) -> stim.PauliString:
@@ -133,12 +251,108 @@ def pauli_string_to_stim(ps: PauliString, n_qubits: int) -> stim.PauliString:
     -----
     Qubits not appearing in ``ps.axes.keys`` are assigned the identity operator in the returned `stim.PauliString`.
     """
-    if not all(0 <= node < n_qubits for node in ps.axes):
+    _check_pauli_string(ps, n_qubits)
+
+    sign = -1 if ps.sign is _SIGN_MINUS else 1
+    if not ps.axes:
+        # Identity strings skip the bit arrays, whose allocation dominates the cost for wide circuits.
+        pauli_str = stim.PauliString(n_qubits)
+        pauli_str.sign = sign
+        return pauli_str
+
+    # Handing stim the X and Z bits directly avoids going through a string which stim would have to parse.
+    x_bits = np.zeros(n_qubits, dtype=np.bool_)
+    z_bits = np.zeros(n_qubits, dtype=np.bool_)
+    _write_pauli_string(ps, x_bits, z_bits)
+    return stim.PauliString.from_numpy(xs=x_bits, zs=z_bits, sign=sign)
+
+
+def _is_identity(clifford_map: CliffordMap) -> bool:
+    """Check whether a Clifford map is the identity.
+
+    The Clifford map is the identity if it maps :math:`X_i` to :math:`X_i` and :math:`Z_i` to :math:`Z_i` for every qubit :math:`i`. This check is linear in the number of qubits and allows to skip the tableau synthesis, which is quadratic at least.
+    """
+    n_qubits = len(clifford_map.output_nodes)
+    if len(clifford_map.input_nodes) != n_qubits:
+        return False
+    x_map, z_map = clifford_map.x_map, clifford_map.z_map
+    return all(
+        x_map[qubit].sign is _SIGN_PLUS
+        and x_map[qubit].axes == {qubit: _AXIS_X}
+        and z_map[qubit].sign is _SIGN_PLUS
+        and z_map[qubit].axes == {qubit: _AXIS_Z}
+        for qubit in range(n_qubits)
+    )
+
+
+def _lower_stim_circuit(stim_circuit: stim.Circuit) -> _INSTRUCTIONS:
+    """Lower a stim circuit into a sequence of ``(gate name, qubit indices)`` pairs.
+
+    This function assumes that all the targets of the circuit are qubits, as is the case for circuits synthesized from tableaux.
+    """
+    # `flattened_operations` is deprecated in favor of iterating over `stim.CircuitInstruction` objects, but it is still
+    # provided by stim 1.x (see requirements.txt). It returns qubit targets as plain integers, which makes it about 20x
+    # faster than decoding `stim.GateTarget` objects from `targets_copy`.
+    return tuple((name, tuple(targets)) for name, targets, _ in stim_circuit.flattened_operations())
+
+
+def _check_pauli_string(ps: PauliString, n_qubits: int) -> None:
+    """Check that a Pauli string is defined on qubit indices compatible with ``n_qubits``.
+
+    Raises
+    ------
+    ValueError
+        If the Pauli string is not compatible with ``n_qubits``.
+    """
+    # `min` and `max` scan the nodes in C, which is cheaper than a Python-level comparison per node.
+    if ps.axes and (min(ps.axes) < 0 or max(ps.axes) >= n_qubits):
         raise ValueError("The Pauli string contains qubit indices beyond the circuit's width.")
 
-    pauli_str = stim.PauliString(n_qubits)
-    if ps.sign == Sign.MINUS:
-        pauli_str *= -1
+
+def _write_pauli_string(ps: PauliString, x_bits: npt.NDArray[np.bool_], z_bits: npt.NDArray[np.bool_]) -> None:
+    """Write the X and Z components of a Pauli string into the bit rows ``x_bits`` and ``z_bits``.
+
+    The rows are assumed to be zero-initialized and the Pauli string is assumed to be compatible with their length. The sign of the Pauli string is ignored.
+    """
+    # Nodes are classified in Python and written with a single vectorized assignment per table, since setting
+    # numpy elements one at a time is comparatively slow.
+    x_nodes: list[int] = []
+    z_nodes: list[int] = []
     for node, axis in ps.axes.items():
-        pauli_str[node] = axis.name
-    return pauli_str
+        if axis is not _AXIS_Z:
+            x_nodes.append(node)
+        if axis is not _AXIS_X:
+            z_nodes.append(node)
+    x_bits[x_nodes] = True
+    z_bits[z_nodes] = True
+
+
+def _emit_cx(circuit: Circuit, qubits: tuple[int, ...]) -> None:
+    """Add the CNOT gates of a lowered CX instruction to the circuit."""
+    cnot = circuit.cnot
+    # A CX instruction holds a flat run of (control, target) pairs.
+    pairs = iter(qubits)
+    for control, target in zip(pairs, pairs, strict=False):
+        cnot(control, target)
+
+
+def _emit_h(circuit: Circuit, qubits: tuple[int, ...]) -> None:
+    """Add the Hadamard gates of a lowered H instruction to the circuit."""
+    h = circuit.h
+    for qubit in qubits:
+        h(qubit)
+
+
+def _emit_s(circuit: Circuit, qubits: tuple[int, ...]) -> None:
+    """Add the S gates of a lowered S instruction to the circuit."""
+    s = circuit.s
+    for qubit in qubits:
+        s(qubit)
+
+
+# Dispatch table from stim gate names to graphix gates (elimination synthesis gate set).
+_GATE_EMITTERS: dict[str, Callable[[Circuit, tuple[int, ...]], None]] = {
+    "CX": _emit_cx,
+    "H": _emit_h,
+    "S": _emit_s,
+}
@@ -1,23 +1,35 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 import networkx as nx
 import numpy as np
 import pytest
 import stim
-from graphix.circ_ext.extraction import PauliString
+from graphix.circ_ext.extraction import CliffordMap, PauliString
 from graphix.fundamentals import Axis, Sign
 from graphix.measurements import Measurement
 from graphix.opengraph import OpenGraph
 from graphix.parameter import Placeholder
 from graphix.random_objects import rand_circuit
-from numpy.random import Generator
+from graphix.transpiler import Circuit
+from numpy.random import PCG64, Generator
 
-from graphix_stim_compiler import cm_stim_pass, pauli_string_to_stim
+from graphix_stim_compiler import cache_info, clear_cache, cm_stim_pass, pauli_string_to_stim
+from graphix_stim_compiler.graphix_stim_compiler import _SynthesisCache
 
-if TYPE_CHECKING:
-    from numpy.random import PCG64
+
+def single_qubit_clifford_map(x_image: Axis, z_image: Axis, x_sign: Sign = Sign.PLUS) -> CliffordMap:
+    return CliffordMap(
+        x_map=[PauliString({0: x_image}, x_sign)],
+        z_map=[PauliString({0: z_image}, Sign.PLUS)],
+        input_nodes=[0],
+        output_nodes=[0],
+    )
 
 
 class TestStimCliffordPass:
@@ -28,6 +40,127 @@ class TestStimCliffordPass:
 
         assert stim_str == stim.PauliString("-_XY_XZ_")
 
+    def test_pauli_string_to_stim_identity(self) -> None:
+        p_str = PauliString({}, Sign.MINUS)
+
+        stim_str = pauli_string_to_stim(p_str, n_qubits=3)
+
+        assert stim_str == stim.PauliString("-___")
+
+    def test_synthesis_cache(self) -> None:
+        clear_cache()
+
+        # Two distinct but equal Clifford maps (Hadamard gate) share the same entry.
+        circuit_1 = Circuit(1)
+        cm_stim_pass(single_qubit_clifford_map(Axis.Z, Axis.X), circuit_1)
+        circuit_2 = Circuit(1)
+        cm_stim_pass(single_qubit_clifford_map(Axis.Z, Axis.X), circuit_2)
+
+        info = cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+        assert info.currsize == 1
+        assert circuit_1.instruction == circuit_2.instruction
+
+        # A different Clifford map (S gate) misses.
+        cm_stim_pass(single_qubit_clifford_map(Axis.Y, Axis.Z), Circuit(1))
+
+        info = cache_info()
+        assert info.misses == 2
+        assert info.hits == 1
+        assert info.currsize == 2
+
+        clear_cache()
+        assert cache_info() == (0, 0, info.maxsize, 0)
+
+    def test_identity_clifford_map(self) -> None:
+        clear_cache()
+        circuit = Circuit(1)
+
+        cm_stim_pass(single_qubit_clifford_map(Axis.X, Axis.Z), circuit)
+
+        assert not circuit.instruction
+        assert cache_info() == (0, 0, cache_info().maxsize, 0)
+
+    def test_near_identity_clifford_map(self) -> None:
+        clear_cache()
+        circuit = Circuit(1)
+
+        # Z gate: X -> -X, Z -> Z
+        cm_stim_pass(single_qubit_clifford_map(Axis.X, Axis.Z, x_sign=Sign.MINUS), circuit)
+
+        assert circuit.instruction
+        assert cache_info().misses == 1
+
+    def test_synthesis_cache_eviction(self) -> None:
+        cache = _SynthesisCache(maxsize=1)
+        tableau_h = stim.Tableau.from_named_gate("H")
+        tableau_s = stim.Tableau.from_named_gate("S")
+
+        cache.synthesize(tableau_h, "elimination")
+        cache.synthesize(tableau_s, "elimination")  # Evicts the entry of `tableau_h`
+        assert len(cache.entries) == 1
+
+        cache.synthesize(tableau_h, "elimination")
+        assert cache.misses == 3
+        assert cache.hits == 0
+
+        cache.synthesize(tableau_h, "elimination")
+        assert cache.misses == 3
+        assert cache.hits == 1
+
+    def test_synthesis_cache_concurrent_eviction(self) -> None:
+        tableau_h = stim.Tableau.from_named_gate("H")
+        tableau_s = stim.Tableau.from_named_gate("S")
+        cache = _SynthesisCache(maxsize=1)
+        cache.synthesize(tableau_h, "elimination")
+
+        threads: list[threading.Thread] = []
+
+        class InterleavedEntries(OrderedDict[Any, Any]):
+            def move_to_end(self, key: Any, last: bool = True) -> None:
+                # Let another thread try to evict `key` between its lookup and its move to the end of the LRU order.
+                if not threads:
+                    thread = threading.Thread(target=cache.synthesize, args=(tableau_s, "elimination"))
+                    threads.append(thread)
+                    thread.start()
+                    thread.join(timeout=0.1)
+                super().move_to_end(key, last)
+
+        cache.entries = InterleavedEntries(cache.entries)
+        assert cache.synthesize(tableau_h, "elimination")
+        threads[0].join()
+
+        assert cache.info() == (1, 2, 1, 1)
+
+    def test_synthesis_cache_threads(self) -> None:
+        cache = _SynthesisCache(maxsize=3)
+        tableaux = [
+            stim.Circuit(circuit).to_tableau()
+            for circuit in ("H 0\nCX 0 1\nS 2", "S 0\nCX 1 2\nH 1", "CX 0 2\nH 2\nS 1", "H 0 1 2\nCX 2 0")
+        ]
+        n_threads = 8
+        n_calls = 2000
+
+        def worker(seed: int) -> None:
+            rng = Generator(PCG64(seed))
+            for _ in range(n_calls):
+                cache.synthesize(tableaux[rng.integers(len(tableaux))], "elimination")
+
+        # Switch threads as often as possible to expose races.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                # `list` propagates the exceptions raised in the threads.
+                list(executor.map(worker, range(n_threads)))
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        info = cache.info()
+        assert info.hits + info.misses == n_threads * n_calls
+        assert info.currsize == 3
+
 
 class TestExtraction:
     @pytest.mark.parametrize("jumps", range(1, 11))